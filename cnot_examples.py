@@ -1,5 +1,5 @@
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
-from qiskit_aer import AerSimulator
+from qiskit.quantum_info import Statevector
 
 # Create quantum registers with 2 qubits
 qr = QuantumRegister(2, 'q')
@@ -19,14 +19,14 @@ circuit.measure(qr, cr)
 print("Quantum Circuit:")
 print(circuit)
 
-# Create and run the simulator
-simulator = AerSimulator()
-result = simulator.run(circuit, shots=1000).result()
+# Compute the final state directly; for a handful of qubits this is exact
+# and skips shot sampling and the simulator's result packaging entirely
+sv = Statevector.from_instruction(circuit.remove_final_measurements(inplace=False))
 
-# Get the counts of measurement outcomes
-counts = result.get_counts(circuit)
+# Get the probabilities of measurement outcomes
+probabilities = sv.probabilities_dict()
 
 # Print the measurement results
-print("\nMeasurement Results:")
-for state, count in counts.items():
-    print(f"|{state}>: {count}")
\ No newline at end of file
+print("\nMeasurement Probabilities:")
+for outcome, probability in probabilities.items():
+    print(f"|{outcome}>: {probability:.2%}")
\ No newline at end of file
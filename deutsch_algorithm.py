@@ -1,42 +1,72 @@
+from functools import lru_cache
+
 from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
+from qiskit.quantum_info import Statevector
+
+from simulator_backend import make_simulator
 
-def deutsch_algorithm(oracle):
+@lru_cache(maxsize=1)
+def get_simulator():
+    """Returns the AerSimulator shared by every run, created on first use."""
+    return make_simulator()
+
+def make_deutsch_circuit(oracle):
+    """Builds the Deutsch circuit around the given oracle gate."""
     # Create a quantum circuit with 2 qubits and 1 classical bit
     qc = QuantumCircuit(2, 1)
-    
+
     # Initialize qubits: |0> and |1>
     qc.x(1)
     qc.h([0, 1])
-    
+
     # Apply the oracle
     qc.append(oracle, [0, 1])
-    
+
     # Hadamard on the first qubit
     qc.h(0)
-    
+
     # Measure the first qubit
     qc.measure(0, 0)
-    
-    # Initialize the AerSimulator
-    simulator = AerSimulator()
+    return qc
+
+@lru_cache(maxsize=None)
+def compile_deutsch_circuit(oracle_type):
+    """Returns the Deutsch circuit for oracle_type, transpiled once and cached."""
+    qc = make_deutsch_circuit(create_oracle(oracle_type))
 
     # Transpile the circuit for the simulator
-    # This optimizes the circuit for the specific backend
-    compiled_circuit = transpile(qc, simulator)
+    # Two qubits need no layout or routing, so skip straight to basis translation
+    return transpile(qc, get_simulator(), optimization_level=0)
+
+def deutsch_algorithm(oracle_type, shots=1024):
+    compiled_circuit = compile_deutsch_circuit(oracle_type)
 
     # Execute the compiled circuit on the simulator
-    # We'll run 1024 shots
-    job = simulator.run(compiled_circuit, shots=1024)
+    job = get_simulator().run(compiled_circuit, shots=shots)
 
-    
     # Get the results from the job
-    result = job.result()    
-    
+    result = job.result()
+
     # Get the measurement counts
-    counts = result.get_counts(compiled_circuit)
+    counts = result.get_counts()
     return counts
 
+def deutsch_algorithm_batch(oracle_types, shots=1024):
+    """Runs the Deutsch circuit for several oracle types as a single job."""
+    compiled_circuits = [compile_deutsch_circuit(o) for o in oracle_types]
+
+    # One run() call for all circuits lets Aer execute the experiments in
+    # parallel and pays the submission overhead only once
+    result = get_simulator().run(compiled_circuits, shots=shots).result()
+    return [result.get_counts(i) for i in range(len(compiled_circuits))]
+
+def deutsch_probabilities(oracle_type):
+    """Returns the exact outcome probabilities of the measured qubit, without sampling."""
+    qc = make_deutsch_circuit(create_oracle(oracle_type))
+    state = Statevector.from_instruction(qc.remove_final_measurements(inplace=False))
+    probabilities = state.probabilities_dict(qargs=[0], decimals=6)
+    return {str(outcome): float(p) for outcome, p in probabilities.items()}
+
 def create_oracle(type='constant'):
     """Returns a Deutsch oracle as a gate."""
     from qiskit.circuit import QuantumCircuit, Gate
@@ -52,7 +82,13 @@ def create_oracle(type='constant'):
     return oracle.to_gate(label=f"{type.capitalize()} Oracle")
 
 if __name__ == "__main__":
-    for oracle_type in ['constant', 'balanced']:
-        oracle = create_oracle(oracle_type)
-        result = deutsch_algorithm(oracle)
-        print(f"Oracle type: {oracle_type}, Result: {result}")
\ No newline at end of file
+    oracle_types = ['constant', 'balanced']
+
+    # The outcome is deterministic, so the exact probabilities say it all
+    for oracle_type in oracle_types:
+        result = deutsch_probabilities(oracle_type)
+        print(f"Oracle type: {oracle_type}, Probabilities: {result}")
+
+    # Sampling on the simulator should agree: every shot gives the same bit
+    for oracle_type, counts in zip(oracle_types, deutsch_algorithm_batch(oracle_types)):
+        print(f"Oracle type: {oracle_type}, Counts: {counts}")
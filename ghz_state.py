@@ -1,5 +1,5 @@
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
-from qiskit_aer import AerSimulator
+from qiskit.quantum_info import Statevector
 
 # Create quantum registers with 3 qubits
 qr = QuantumRegister(3, 'q')
@@ -20,19 +20,19 @@ circuit.measure(qr, cr)
 print("Quantum Circuit:")
 print(circuit)
 
-# Create and run the simulator
-simulator = AerSimulator()
-result = simulator.run(circuit, shots=1000).result()
+# Compute the final state directly; for a handful of qubits this is exact
+# and skips shot sampling and the simulator's result packaging entirely
+sv = Statevector.from_instruction(circuit.remove_final_measurements(inplace=False))
 
-# Get the counts of measurement outcomes
-counts = result.get_counts(circuit)
+# Get the probabilities of measurement outcomes
+probabilities = sv.probabilities_dict()
 
 # Print the measurement results
-print("\nMeasurement Results:")
-for state, count in counts.items():
-    print(f"|{state}>: {count}")
+print("\nMeasurement Probabilities:")
+for outcome, probability in probabilities.items():
+    print(f"|{outcome}>: {probability:.2%}")
 
 print("\nNote: In the GHZ state, you should only see measurements")
-print("of |000> and |111> with roughly equal probability (~50% each).")
+print("of |000> and |111> with equal probability (50% each).")
 print("This demonstrates three-qubit entanglement where measuring")
 print("any one qubit determines the state of all other qubits.")
\ No newline at end of file
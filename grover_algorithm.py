@@ -1,8 +1,15 @@
+import heapq
 import numpy as np
 import math
 from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
 from qiskit.circuit.library import GroverOperator
+from qiskit.transpiler.passes import RemoveBarriers
+
+from simulator_backend import make_simulator
+
+# Use AerSimulator for simulating the circuit. It is created once and shared
+# by every simulate_grover call; shots are passed per run() instead.
+simulator = make_simulator(batched_shots_gpu=True)
 
 # --- 1. Problem Definition ---
 NUM_QUBITS = 4 # n
@@ -34,8 +41,8 @@ def create_oracle(marked_state: str) -> QuantumCircuit:
     Creates a phase oracle that flips the phase of the marked_state.
     
     The marked_state is marked by applying X gates to flip the '0' bits
-    to '1's, then applying a multi-controlled Z (MCZ) gate, and finally
-    applying X gates to restore the unmarked qubits.
+    to '1's, then applying a multi-controlled Z (MCZ) gate (a multi-controlled
+    phase of pi), and finally applying X gates to restore the unmarked qubits.
     """
     n = len(marked_state)
     oracle = QuantumCircuit(n, name="Oracle")
@@ -46,27 +53,22 @@ def create_oracle(marked_state: str) -> QuantumCircuit:
         if bit == '0':
             oracle.x(i)
 
-    # Since Qiskit provides MultiControlGate classes, let's define the MCX
-    # and sandwich it with H and X for the phase flip.
+    # A multi-controlled phase of pi on all qubits is exactly the MCZ we need,
+    # and it synthesizes more cheaply than an MCX sandwiched by H gates.
     
     # 1. Define control qubits (all of them)
     control_qubits = list(range(n))
     
-    # 2. To implement MCZ on all qubits, we apply MCX,
-    #    with the last qubit as target, sandwiched by H gates.
-    oracle.h(n - 1)
-    # Apply Multi-Controlled X (MCX) gate
+    # 2. Apply the multi-controlled phase flip
     # Controls: 0 to n-2
     # Target: n-1
-    oracle.mcx(control_qubits[:-1], n - 1)
-    oracle.h(n - 1)
+    oracle.mcp(np.pi, control_qubits[:-1], n - 1)
 
     # Apply X-gates where the target state had a '0' to uncompute
     for i, bit in enumerate(reversed(marked_state)):
         if bit == '0':
             oracle.x(i)
             
-    oracle.barrier()
     return oracle
 
 # Create the specific oracle for |1101⟩
@@ -86,11 +88,21 @@ grover_circuit.barrier()
 # We can use the built-in GroverOperator class for the diffusion part,
 # feeding it our custom oracle.
 
-grover_op = GroverOperator(oracle=oracle_qc, insert_barriers=True)
+# The operator is appended below as a single boxed instruction, so barriers
+# inside it would never show up in a drawing; leave them out so they don't
+# block gate fusion and cancellation in the simulator.
+grover_op = GroverOperator(oracle=oracle_qc, insert_barriers=False)
 
-# Apply the Grover iteration R times
+# Synthesize and optimize the operator (oracle + diffuser) for the simulator
+# once, so transpiling the full circuit only has to inline the result instead
+# of redoing the same work for every iteration.
+grover_op_compiled = transpile(grover_op, simulator, optimization_level=3)
+
+# Convert the operator to an instruction once and append it R times,
+# rather than re-composing it gate by gate on every iteration
+grover_inst = grover_op_compiled.to_instruction()
 for _ in range(OPTIMAL_ITERATIONS):
-    grover_circuit.compose(grover_op, inplace=True)
+    grover_circuit.append(grover_inst, range(NUM_QUBITS))
     grover_circuit.barrier()
 
 # 3. Measurement
@@ -102,16 +114,16 @@ grover_circuit.measure(range(NUM_QUBITS), range(NUM_QUBITS))
 # --- 5. Simulation and Results ---
 def simulate_grover(circuit: QuantumCircuit, shots=1024):
     """Simulates the Grover circuit and returns the measurement counts."""
-    # Use AerSimulator for simulating the circuit
-    simulator = AerSimulator()
-    
     # Execute the circuit and get the result
-    compiled_circuit = transpile(circuit, simulator)
+    # Barriers are only there for drawing; strip them first so they don't
+    # block gate fusion in the simulator. The simulator needs no layout or
+    # routing and fuses gates itself, so optimization_level=0 is enough.
+    compiled_circuit = transpile(RemoveBarriers()(circuit), simulator, optimization_level=0)
     job = simulator.run(compiled_circuit, shots=shots)
     result = job.result()
     
     # Get the counts from the result
-    counts = result.get_counts(circuit)    
+    counts = result.get_counts()
     return counts
 
 # Run the simulation
@@ -120,8 +132,8 @@ final_counts = simulate_grover(grover_circuit, shots=8192)
 # --- 6. Analysis and Visualization ---
 
 print("--- Simulation Results (8192 shots) ---")
-# Get the top 5 results
-top_results = list(final_counts.items())[:5]
+# Get the top 5 results by count, without sorting every outcome
+top_results = heapq.nlargest(5, final_counts.items(), key=lambda kv: kv[1])
 for bitstring, count in top_results:
     is_solution = " (Solution)" if bitstring == MARKED_STATE else ""
     # Convert count back to percentage for clearer view
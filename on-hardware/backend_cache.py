@@ -0,0 +1,47 @@
+# Shared, memoized access to the IBM Runtime service, backend and pass
+# managers used by the scripts in this folder.
+#
+# Each lookup below costs at least one REST round-trip, so it is done once
+# per process and reused. The backend Target (calibration data) is also
+# pickled to disk, keyed by backend name and date, so later runs on the same
+# day can build pass managers without fetching it again.
+
+import pickle
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+
+from qiskit.transpiler import generate_preset_pass_manager
+from qiskit_ibm_runtime import QiskitRuntimeService
+
+TARGET_CACHE_DIR = Path(__file__).with_name(".target_cache")
+
+@lru_cache(maxsize=1)
+def get_service():
+    """Returns the QiskitRuntimeService built from the saved account."""
+    return QiskitRuntimeService()
+
+@lru_cache(maxsize=1)
+def get_backend():
+    """Returns the least busy operational hardware backend."""
+    return get_service().least_busy(simulator=False, operational=True)
+
+@lru_cache(maxsize=1)
+def get_target():
+    """Returns the backend Target, loading today's pickled copy if present."""
+    backend = get_backend()
+    path = TARGET_CACHE_DIR / f"{backend.name}-{date.today().isoformat()}.pkl"
+    if path.exists():
+        with path.open("rb") as f:
+            return pickle.load(f)
+
+    target = backend.target
+    TARGET_CACHE_DIR.mkdir(exist_ok=True)
+    with path.open("wb") as f:
+        pickle.dump(target, f)
+    return target
+
+@lru_cache(maxsize=8)
+def get_pm(opt_level=1):
+    """Returns a preset pass manager for the backend at the given optimization level."""
+    return generate_preset_pass_manager(optimization_level=opt_level, target=get_target())
@@ -1,8 +1,8 @@
 from qiskit import QuantumCircuit
 from qiskit.quantum_info import SparsePauliOp
-from qiskit.transpiler import generate_preset_pass_manager
-from qiskit_ibm_runtime import QiskitRuntimeService, EstimatorV2 as Estimator
-from matplotlib import pyplot as plt
+from qiskit_ibm_runtime import EstimatorV2 as Estimator
+
+from backend_cache import get_backend, get_pm
 
 # Create a new circuit with two qubits
 qc = QuantumCircuit(2)
@@ -24,17 +24,17 @@ print(qc)
 # Set up six different observables.
  
 observables_labels = ["IZ", "IX", "ZI", "XI", "ZZ", "XX"]
-observables = [SparsePauliOp(label) for label in observables_labels]
+# Packed as the terms of one operator so the layout can be applied to all
+# six at once below.
+observables = SparsePauliOp(observables_labels)
 
-service = QiskitRuntimeService()
- 
-backend = service.least_busy(simulator=False, operational=True)
+backend = get_backend()
  
 # Convert to an ISA circuit and layout-mapped observables.
-pm = generate_preset_pass_manager(backend=backend, optimization_level=1)
+pm = get_pm(1)
 isa_circuit = pm.run(qc)
  
-isa_circuit.draw("mpl", idle_wires=False)
+print(isa_circuit.draw(idle_wires=False))
 
 # Construct the Estimator instance.
  
@@ -42,8 +42,10 @@ estimator = Estimator(mode=backend)
 estimator.options.resilience_level = 1
 estimator.options.default_shots = 5000
  
+# Map every observable through the layout in a single call, then split the
+# mapped terms back out into one observable each.
 mapped_observables = [
-    observable.apply_layout(isa_circuit.layout) for observable in observables
+    SparsePauliOp(pauli) for pauli in observables.apply_layout(isa_circuit.layout).paulis
 ]
  
 # One pub, with one circuit to run against five different observables.
@@ -68,6 +70,10 @@ errors = pub_result.data.stds
 observables_labels = ["IZ", "IX", "ZI", "XI", "ZZ", "XX"]
  
 # plotting graph
+# Matplotlib is imported only here, so the rest of the script doesn't pay
+# its startup cost
+from matplotlib import pyplot as plt
+
 plt.plot(observables_labels, values, "-o")
 plt.xlabel("Observables")
 plt.ylabel("Values")
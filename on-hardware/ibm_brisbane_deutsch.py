@@ -5,10 +5,12 @@
 import numpy as np
 
 # Import necessary components from Qiskit and Qiskit IBM Runtime
-from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
-from qiskit_ibm_runtime import QiskitRuntimeService, EstimatorV2
+from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
+from qiskit_ibm_runtime import EstimatorV2
 from qiskit.quantum_info import SparsePauliOp
 
+from backend_cache import get_backend, get_pm
+
 def build_oracle(qc, oracle_qubit, helper_qubit, secret_bit):
     """
     Constructs the oracle for the Deutsch algorithm.
@@ -83,20 +85,21 @@ print(balanced_circuit)
 # Note: You need an IBM Quantum account and a saved API token/instance
 # in order for this to work.
 
-# Initialize the QiskitRuntimeService
-# This loads your saved credentials from disk.
+# Select a backend. backend_cache initializes the QiskitRuntimeService from
+# your saved credentials and picks the least busy real device.
 # service = QiskitRuntimeService(channel="ibm_cloud", token="MY_API_KEY", region="us-east")
-service = QiskitRuntimeService()
-
-# Select a backend. Here, we use a simulator. You can replace this
-# with a real quantum device if you have access to it.
-backend = service.least_busy(simulator=False, operational=True)
-
-# Define the circuits to be run.
+backend = get_backend()
+
+# Define the circuits to be run. Each function keeps its own fixed oracle:
+# a single parametric circuit would transpile only once, but its oracle costs
+# two two-qubit gates for both functions, where the fixed oracles need none
+# (constant) and one (balanced). On hardware that extra gate error outweighs
+# the saved transpile of a 2-qubit circuit. Both circuits still go through
+# the pass manager in a single call.
 circuits_to_run = [constant_circuit, balanced_circuit]
 
 # Transpile the circuits for the specific backend. This step is crucial.
-transpiled_circuits = transpile(circuits_to_run, backend=backend, optimization_level=3)
+transpiled_circuits = get_pm(3).run(circuits_to_run)
     
 # Using EstimatorV2 to get the expectation value of the measurement result.
 # The backend must now be passed as the `mode` argument.
@@ -13,12 +13,36 @@
 # pip install matplotlib
 
 import math
+from fractions import Fraction
+from functools import lru_cache
+
 import numpy as np
 from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
 from qiskit.quantum_info import Statevector
 from qiskit.circuit.library import QFT
-from qiskit.visualization import plot_histogram
+
+from simulator_backend import make_simulator
+
+# The simulator is created once and reused by every shor_algorithm() call.
+simulator = make_simulator()
+
+# This is a correct, hard-coded modular exponentiation circuit for a=7, N=15.
+# The powers of 7 mod 15 are: 7^1=7, 7^2=4, 7^3=13, 7^4=1. Period r=4.
+# Only four distinct transformations exist, so each one is built once here
+# and looked up by power % 4, instead of being rebuilt on every call.
+_AMOD15_SWAPS = {
+    0: [],                          # a^4 = 1 mod 15, no change
+    1: [(0, 1), (1, 2), (2, 3)],    # a^1 = 7 mod 15, |x> -> |7x mod 15>
+    2: [(1, 3), (0, 2)],            # a^2 = 4 mod 15, |x> -> |4x mod 15>
+    3: [(0, 3), (0, 2), (1, 3)],    # a^3 = 13 mod 15, |x> -> |13x mod 15>
+}
+
+_AMOD15_GATES = {}
+for p, swaps in _AMOD15_SWAPS.items():
+    U = QuantumCircuit(4)
+    for q0, q1 in swaps:
+        U.swap(q0, q1)
+    _AMOD15_GATES[p] = U.to_gate(label=f"7^{p}mod15")
 
 def c_amod15(a, power):
     """
@@ -31,36 +55,18 @@ def c_amod15(a, power):
         power (int): The power of 'a' to be used in the exponentiation.
     
     Returns:
-        QuantumCircuit: A circuit for the controlled modular exponentiation.
+        Gate: A 4-qubit gate for the modular exponentiation.
     """
-    U = QuantumCircuit(4)
-    # This is a correct, hard-coded modular exponentiation circuit for a=7, N=15.
-    # The powers of 7 mod 15 are: 7^1=7, 7^2=4, 7^3=13, 7^4=1. Period r=4.
-    # We apply the transformation according to the power.
-    
     if a != 7:
         print("Error: This function is hard-coded for a=7.")
-        return U.to_gate()
-
-    if power % 4 == 0:
-        # a^4 = 1 mod 15, no change
-        pass
-    elif power % 4 == 1:
-        # a^1 = 7 mod 15, which is |x> -> |7x mod 15>
-        U.swap(0, 1)
-        U.swap(1, 2)
-        U.swap(2, 3)
-    elif power % 4 == 2:
-        # a^2 = 4 mod 15, which is |x> -> |4x mod 15>
-        U.swap(1, 3)
-        U.swap(0, 2)
-    elif power % 4 == 3:
-        # a^3 = 13 mod 15, which is |x> -> |13x mod 15>
-        U.swap(0, 3)
-        U.swap(0, 2)
-        U.swap(1, 3)
-
-    return U.to_gate()
+        return QuantumCircuit(4).to_gate()
+
+    return _AMOD15_GATES[power % 4]
+
+@lru_cache(maxsize=None)
+def _controlled_amod15(a, residue):
+    """Returns c_amod15(a, residue) with one control qubit, synthesized once per residue."""
+    return c_amod15(a, residue).control(1)
 
 def shor_algorithm():
     """
@@ -96,10 +102,11 @@ def shor_algorithm():
         # We need to apply the modular exponentiation a^(2^q) mod N.
         # This is where the c_amod15 circuit is used.
         power_of_a = int(2**q)
-        gate = c_amod15(a, power_of_a)
         
         # The controlled version of our 4-qubit gate now needs 5 qubits in total.
-        qc.append(gate.control(1), [q] + list(range(n_count, n_count + 4)))
+        # Only power % 4 matters, so the controlled gate is cached per residue.
+        controlled_gate = _controlled_amod15(a, power_of_a % 4)
+        qc.append(controlled_gate, [q] + list(range(n_count, n_count + 4)))
     
     # Step 5: Apply the inverse Quantum Fourier Transform (QFT).
     # This is a key part of the algorithm, used to extract the period.
@@ -110,8 +117,9 @@ def shor_algorithm():
     qc.measure(range(n_count), range(n_count))
 
     # Step 7: Run the simulation.
-    simulator = AerSimulator()
-    transpiled_qc = transpile(qc, simulator)
+    # The simulator needs no layout or routing and fuses gates itself,
+    # so only basis translation is needed.
+    transpiled_qc = transpile(qc, simulator, optimization_level=0)
     shots = 1000
     job = simulator.run(transpiled_qc, shots=shots)
     result = job.result()
@@ -121,22 +129,23 @@ def shor_algorithm():
     print(counts)
     
     # Plot a histogram of the results
+    # Imported here so matplotlib is only loaded once there is something to plot
+    from qiskit.visualization import plot_histogram
     plot_histogram(counts, title="Shor's Algorithm Period-Finding Results")
     
     # Step 8: Classical post-processing to find the period 'r' and factors.
     measured_periods = []
-    for measurement in counts:
-        decimal = int(measurement, 2)
+    measured_values = np.fromiter((int(m, 2) for m in counts), dtype=np.int64)
+    phases = measured_values / (1 << n_count)
+    for measurement, decimal, phase in zip(counts, measured_values, phases):
         print(f"Measured value: {measurement} (decimal {decimal})")
         # We look for a period 'r' such that c/2^n is a close approximation of k/r.
-        # We can find this by checking denominators of the measured value's continued fraction.
-        # Here we just use a simplified approach to find 'r' from the measured output.
+        # The continued-fraction expansion of the phase, limited to denominators
+        # below N, gives the best such k/r; its denominator is the candidate period.
         if decimal != 0:
-            r = 2**n_count / decimal
-            if r % 1 == 0:  # Check if r is an integer
-                r = int(r)
-                if r % 2 == 0 and r not in measured_periods:
-                    measured_periods.append(r)
+            r = Fraction(float(phase)).limit_denominator(N).denominator
+            if r % 2 == 0 and pow(a, r, N) == 1 and r not in measured_periods:
+                measured_periods.append(r)
                     
     print("\nPossible periods (r) from measurements:")
     print(measured_periods)
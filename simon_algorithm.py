@@ -1,5 +1,9 @@
+import numpy as np
 from qiskit import QuantumCircuit, transpile
-from qiskit_aer import AerSimulator
+from qiskit.circuit.library import LinearFunction
+from qiskit.transpiler.passes import RemoveBarriers
+
+from simulator_backend import make_simulator
 
 # --- Parameters ---
 N = 3  # Number of qubits for input and output (total 2N qubits)
@@ -10,7 +14,6 @@ if len(SECRET_STRING) != N:
 
 def make_simon_oracle(n, s):
     
-    qc = QuantumCircuit(2 * n)
     s_list = [int(bit) for bit in s[::-1]] # LSB is at index 0
 
     # The oracle must implement two conditions:
@@ -22,10 +25,16 @@ def make_simon_oracle(n, s):
     # We choose f(x) = x_0 for x_0=0 and f(x) = x_1 XOR x_2 for x_0=1
     # which satisfies the s="101" periodicity constraint.
 
+    # Both steps below are CNOTs from input to output qubits, i.e. a linear
+    # map over GF(2). We accumulate them into a binary matrix (XOR-ing, since
+    # two CNOTs on the same pair cancel) and synthesize the whole map at once,
+    # which needs fewer CNOTs than emitting them one by one.
+    linear = np.eye(2 * n, dtype=bool)
+
     # 1. Start by copying the input register to the output register (CNOTs)
     # This ensures f(x) has a dependence on x.
     for i in range(n):
-        qc.cx(i, i + n)
+        linear[i + n, i] ^= True
 
     # 2. Enforce the s-periodicity: f(x) = f(x XOR s)
     # This is done by adding CNOTs from input bits where s_i = 1 to ALL output bits.
@@ -35,9 +44,9 @@ def make_simon_oracle(n, s):
     for i in range(n):
         if s_list[i] == 1:
             for j in range(n):
-                qc.cx(i, j + n)
+                linear[j + n, i] ^= True
 
-    return qc
+    return LinearFunction(linear).definition
 
 
 def make_simon_circuit(n, oracle):
@@ -78,15 +87,18 @@ print(simon_circuit.draw(fold=-1))
 # 3. Execute the circuit on a simulator
 print("\n--- Executing on Qiskit Sampler (Simulator) ---")
 # Use AerSimulator for simulating the circuit
-simulator = AerSimulator()
+simulator = make_simulator()
 
 # Execute the circuit and get the result
-compiled_circuit = transpile(simon_circuit, simulator)
+# Barriers are only there for drawing; strip them first so they don't
+# block gate fusion in the simulator. The simulator needs no layout or
+# routing and fuses gates itself, so optimization_level=0 is enough.
+compiled_circuit = transpile(RemoveBarriers()(simon_circuit), simulator, optimization_level=0)
 job = simulator.run(compiled_circuit, shots=1024)
 result = job.result()
 
 # Get the counts from the result
-counts = result.get_counts(simon_circuit)    
+counts = result.get_counts()
 
 print("\n--- Measurement Results (y) ---")
 print(counts)
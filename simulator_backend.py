@@ -0,0 +1,20 @@
+# Shared AerSimulator construction for the simulation scripts in this folder.
+#
+# The simulators run on the cuStateVec GPU backend when qiskit-aer-gpu is
+# installed and fall back to the default CPU simulator otherwise. The device
+# probe needs a throwaway AerSimulator, so it is done once per process.
+
+from functools import lru_cache
+
+from qiskit_aer import AerSimulator
+
+@lru_cache(maxsize=1)
+def available_devices():
+    """Returns the devices the installed Aer build can simulate on."""
+    return AerSimulator().available_devices()
+
+def make_simulator(**gpu_options):
+    """Returns a statevector AerSimulator, on the GPU when one is available."""
+    if 'GPU' in available_devices():
+        return AerSimulator(method='statevector', device='GPU', cuStateVec_enable=True, **gpu_options)
+    return AerSimulator()